@@ -4,52 +4,89 @@ PrintLoop Hybrid - Combining minimal UI with V4 visuals and full functionality
 This version uses the stable minimal UI framework with enhanced visuals and all features.
 """
 
+import logging
 import os
 import sys
-import zipfile
-import tempfile
-import shutil
 import re
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
 import getpass  # To get the current username
-import webbrowser  # To open web links
-from PIL import Image, ImageTk
+from itertools import chain
+
+# Heavier modules (PIL especially) are imported lazily inside the functions
+# that need them, so the GUI comes up without paying for them at startup.
+
+# Debug output goes through logging so processing loops don't pay for
+# synchronous console writes unless the user opts in via PRINTLOOP_LOG
+log = logging.getLogger("printloop")
+
+# Matches the plate number in Metadata/plate_N.gcode entry names
+_PLATE_RE = re.compile(r'plate_(\d+)')
+
+# Everything bundled next to the script (loop G-code, images) hangs off
+# this directory; resolve it once instead of per lookup
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _repeated_block_parts(name, content, start_gcode, end_gcode, count):
+    """Return the byte fragments for one plate repeated `count` times.
+
+    The start/plate/end payload is identical for every copy, so it appears
+    in the fragment list as `count` references to one bytes object. A writer
+    that consumes the fragments directly (writelines) therefore streams all
+    the copies while only ever holding a single copy of the plate in memory.
+    Only the per-copy markers keep this from being a literal payload * count.
+
+    `start_gcode` and `end_gcode` are bytes; the callers keep them encoded
+    so the same blocks aren't re-encoded for every plate.
+    """
+    payload = b"\n".join((start_gcode, content, end_gcode))
+
+    # The plate name and total count are loop-invariant; format them once
+    # and leave only the copy index for the per-iteration %d fill-in
+    hdr_tpl = f";===== Start of {name} (Copy %d/{count}) =====\n".encode("utf-8")
+    ftr_tpl = f";===== End of {name} (Copy %d/{count}) =====\n\n".encode("utf-8")
+
+    parts = []
+    for i in range(1, count + 1):
+        parts.append(hdr_tpl % i)
+        parts.append(payload)
+        parts.append(ftr_tpl % i)
+    return parts
 
 
 class PrintLoopHybrid:
     """Hybrid version of PrintLoop with minimal UI framework and V4 visuals."""
-    
+
+    # Resized welcome logo, built once and reused across dialog invocations
+    _logo_photo_cache = None
+
     def __init__(self, root):
         """Initialize the application."""
         self.root = root
         self.root.title("PrintLoop V4")
         self.root.geometry("800x700")
-        style = ttk.Style(self.root)
-        style.theme_use("default")  # or "clam" for better visuals
-        style.configure("TButton", foreground="black")
-
 
         # Print debug info to console
-        print("Initializing PrintLoop Hybrid...")
-        print(f"Python version: {sys.version}")
-        print(f"Tkinter version: {tk.TkVersion}")
-        print(f"Current directory: {os.getcwd()}")
+        log.debug("Initializing PrintLoop Hybrid...")
+        log.debug("Python version: %s", sys.version)
+        log.debug("Tkinter version: %s", tk.TkVersion)
+        log.debug("Current directory: %s", os.getcwd())
         
         # Set application icon if available
         try:
-            icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "printloop_logo.ico")
+            icon_path = os.path.join(_SCRIPT_DIR, "images", "printloop_logo.ico")
             self.root.iconbitmap(icon_path)
-            print(f"Set application icon from: {icon_path}")
+            log.debug("Set application icon from: %s", icon_path)
         except Exception as e:
-            print(f"Could not load icon: {e}")
+            log.debug("Could not load icon: %s", e)
         
         # Get username and set default printer
         self.username = getpass.getuser()
         self.selected_printer = "Bambu A1"
-        print(f"Username: {self.username}")
-        print(f"Selected printer: {self.selected_printer}")
+        log.debug("Username: %s", self.username)
+        log.debug("Selected printer: %s", self.selected_printer)
         
         # Variables
         self.input_file_var = tk.StringVar()
@@ -68,8 +105,13 @@ class PrintLoopHybrid:
         self.progress_var = tk.DoubleVar(value=0)
         self.open_after_var = tk.BooleanVar(value=True)
         
-        # For advanced mode
-        self.plate_repetitions_vars = {}
+        # For advanced mode: plate name -> Spinbox widget. The values are
+        # read once at submit time, so there is no per-plate Tcl variable.
+        self.plate_spinboxes = {}
+
+        # Plate signature the advanced settings UI was last built for, so mode
+        # switches don't rebuild an up-to-date widget list
+        self._advanced_built_for = None
         
         # Last used directory
         self.last_directory = os.path.expanduser("~")
@@ -94,14 +136,40 @@ class PrintLoopHybrid:
         
         # Detected plates
         self.detected_plates = []
+
+        # Plate-list cache keyed by (input_file, mtime) so detection and
+        # processing don't both have to scan the same archive
+        self._plates_cache = {}
+
+        # Start/end loop G-code, read once instead of on every processing run
+        self._start_gcode = self._load_loop_gcode("Start_A1_PrintLoop.txt")
+        self._end_gcode = self._load_loop_gcode("End_A1_PrintLoop.txt")
         
         # Print debug info
-        print("UI initialization complete")
+        log.debug("UI initialization complete")
     
+    def _load_loop_gcode(self, filename):
+        """Read one of the bundled loop G-code files shipped next to the script.
+
+        Returned as bytes - all the plate assembly works on bytes, so the
+        blocks are encoded exactly once here.
+        """
+        path = os.path.join(_SCRIPT_DIR, filename)
+        # Open directly instead of probing with os.path.exists first - one
+        # less stat() and no window for the file to disappear in between
+        try:
+            with open(path, 'rb') as f:
+                log.debug("Reading loop G-code from: %s", path)
+                return f.read()
+        except FileNotFoundError:
+            log.warning("Warning: %s not found, using empty string", filename)
+            return b""
+
     def apply_styles(self):
-        """Apply custom styles to the UI elements."""
-        style = ttk.Style()
-        
+        """Apply custom styles to the UI elements (single source of truth)."""
+        style = ttk.Style(self.root)
+        style.theme_use("default")  # or "clam" for better visuals
+
         # Configure styles
         style.configure("TFrame", background=self.colors["white"])
         style.configure("TLabel", background=self.colors["white"], foreground=self.colors["dark_gray"])
@@ -155,16 +223,20 @@ class PrintLoopHybrid:
         
         # Logo
         try:
-            logo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "printloop_logo.png")
-            logo_image = Image.open(logo_path)
-            logo_image = logo_image.resize((150, 150), Image.LANCZOS)
-            logo_photo = ImageTk.PhotoImage(logo_image)
-            
-            logo_label = ttk.Label(main_frame, image=logo_photo)
-            logo_label.image = logo_photo  # Keep a reference
+            from PIL import Image, ImageTk
+
+            if PrintLoopHybrid._logo_photo_cache is None:
+                logo_path = os.path.join(_SCRIPT_DIR, "images", "printloop_logo.png")
+                logo_image = Image.open(logo_path)
+                # BILINEAR is visually identical to LANCZOS at this size and
+                # several times cheaper; thumbnail also keeps the aspect ratio
+                logo_image.thumbnail((150, 150), Image.BILINEAR)
+                PrintLoopHybrid._logo_photo_cache = ImageTk.PhotoImage(logo_image)
+
+            logo_label = ttk.Label(main_frame, image=PrintLoopHybrid._logo_photo_cache)
             logo_label.pack(pady=(0, 20))
         except Exception as e:
-            print(f"Error loading logo: {e}")
+            log.error("Error loading logo: %s", e)
         
         # Welcome text
         ttk.Label(main_frame, text=f"Welcome, {self.username}!", style="Title.TLabel").pack(pady=(0, 10))
@@ -231,11 +303,11 @@ class PrintLoopHybrid:
         self.main_frame = ttk.Frame(self.main_canvas, padding="10")
         self.main_canvas.create_window((0, 0), window=self.main_frame, anchor="nw", width=self.root.winfo_width()-20)
         
-        # Enable mousewheel scrolling
-        self.root.bind_all("<MouseWheel>", lambda event: self.main_canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-        # For Linux
-        self.root.bind_all("<Button-4>", lambda event: self.main_canvas.yview_scroll(-1, "units"))
-        self.root.bind_all("<Button-5>", lambda event: self.main_canvas.yview_scroll(1, "units"))
+        # Enable mousewheel scrolling only while the pointer is over the
+        # canvas, so spinboxes keep their native wheel behaviour and events
+        # elsewhere don't go through Python at all
+        self.main_canvas.bind("<Enter>", self._bind_scroll_events)
+        self.main_canvas.bind("<Leave>", self._unbind_scroll_events)
         
         # Header with user and printer info
         self.create_header()
@@ -339,6 +411,33 @@ class PrintLoopHybrid:
         
         ttk.Label(status_frame, textvariable=self.status_var).pack(fill=tk.X, padx=5, pady=5)
 
+    def _bind_scroll_events(self, event):
+        """Install the wheel bindings when the pointer enters the canvas."""
+        self.main_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        # For Linux
+        self.main_canvas.bind_all("<Button-4>", self._on_scroll_up)
+        self.main_canvas.bind_all("<Button-5>", self._on_scroll_down)
+
+    def _unbind_scroll_events(self, event):
+        """Remove the wheel bindings when the pointer leaves the canvas."""
+        self.main_canvas.unbind_all("<MouseWheel>")
+        self.main_canvas.unbind_all("<Button-4>")
+        self.main_canvas.unbind_all("<Button-5>")
+
+    def _on_mousewheel(self, event):
+        """Scroll the main canvas from a <MouseWheel> event."""
+        # Integer division avoids a float divide + int() per event; wheel
+        # events fire at high frequency during smooth scrolling
+        self.main_canvas.yview_scroll(-(event.delta // 120), "units")
+
+    def _on_scroll_up(self, event):
+        """Scroll the main canvas up (Linux <Button-4>)."""
+        self.main_canvas.yview_scroll(-1, "units")
+
+    def _on_scroll_down(self, event):
+        """Scroll the main canvas down (Linux <Button-5>)."""
+        self.main_canvas.yview_scroll(1, "units")
+
     def create_header(self):
         """Create the header section with user and printer info."""
         header_frame = ttk.Frame(self.main_frame, style="Header.TFrame")
@@ -351,7 +450,12 @@ class PrintLoopHybrid:
         # Add a link to the project's GitHub page
         github_link = ttk.Label(header_frame, text="GitHub", foreground="blue", cursor="hand2", style="Header.TLabel")
         github_link.pack(side=tk.RIGHT, padx=10, pady=5)
-        github_link.bind("<Button-1>", lambda e: webbrowser.open_new("https://github.com/your-repo/printloop"))
+
+        def open_github(event):
+            import webbrowser
+            webbrowser.open_new("https://github.com/your-repo/printloop")
+
+        github_link.bind("<Button-1>", open_github)
 
     def on_color_mode_change(self):
         """Handle changes in color mode selection."""
@@ -388,7 +492,7 @@ class PrintLoopHybrid:
     
     def browse_input_file(self):
         """Open a file dialog to select the input .gcode.3mf file."""
-        print("Browsing for input file...")
+        log.debug("Browsing for input file...")
         file_path = filedialog.askopenfilename(
             initialdir=self.last_directory,
             title="Select .gcode.3mf file",
@@ -401,14 +505,14 @@ class PrintLoopHybrid:
             # Set output filename automatically
             base_name = os.path.basename(file_path).replace(".gcode.3mf", "")
             self.output_filename_var.set(f"{base_name}_single_x1.gcode.3mf")
-            print(f"Output filename set to: {self.output_filename_var.get()}")
+            log.debug("Output filename set to: %s", self.output_filename_var.get())
             
             # Detect plates and update UI for advanced mode
             self.detect_plates(file_path)
     
     def browse_output_dir(self):
         """Open a directory dialog to select the output folder."""
-        print("Browsing for output directory...")
+        log.debug("Browsing for output directory...")
         dir_path = filedialog.askdirectory(
             initialdir=self.last_directory,
             title="Select Output Directory"
@@ -419,6 +523,8 @@ class PrintLoopHybrid:
     
     def open_output_folder(self, path):
         """Open the output folder in the file explorer."""
+        import subprocess
+
         try:
             if sys.platform == "win32":
                 os.startfile(path)
@@ -426,41 +532,50 @@ class PrintLoopHybrid:
                 subprocess.Popen(["open", path])
             else:
                 subprocess.Popen(["xdg-open", path])
-            print(f"Opening output folder: {path}")
+            log.debug("Opening output folder: %s", path)
         except Exception as e:
-            print(f"Error opening folder: {e}")
+            log.error("Error opening folder: %s", e)
             messagebox.showerror("Error", f"Could not open output folder: {e}")
             
+    def _list_plate_names(self, input_file):
+        """Return the sorted plate_*.gcode names in the archive, cached by path+mtime."""
+        import zipfile
+
+        cache_key = (input_file, os.path.getmtime(input_file))
+        if cache_key in self._plates_cache:
+            return self._plates_cache[cache_key]
+
+        # Read the archive's entry list only - no extraction needed just to
+        # find out which plates exist
+        with zipfile.ZipFile(input_file, 'r') as zip_ref:
+            names = [n for n in zip_ref.namelist()
+                     if n.startswith("Metadata/plate_") and n.endswith(".gcode")
+                     and "/" not in n[len("Metadata/"):]]
+
+        # Decorate with the plate number once per name instead of re-running
+        # the regex on every sort comparison
+        numbered = [(int(_PLATE_RE.search(n).group(1)), os.path.basename(n)) for n in names]
+        numbered.sort()
+        plate_names = [name for _, name in numbered]
+
+        self._plates_cache = {cache_key: plate_names}
+        return plate_names
+
     def detect_plates(self, input_file):
         """Detects plate files within the .gcode.3mf archive and updates the UI for advanced mode."""
         self.detected_plates = []
-        self.plate_repetitions_vars = {}
-        
-        temp_dir = None
+        self.plate_spinboxes = {}
+        # The spinboxes are being recreated, so any previously built advanced
+        # settings UI is stale regardless of the plate names
+        self._advanced_built_for = None
+
         try:
-            print(f"Detecting plates in: {input_file}")
-            temp_dir = tempfile.mkdtemp()
-            print(f"Created temporary directory: {temp_dir}")
-            
-            with zipfile.ZipFile(input_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            metadata_dir = os.path.join(temp_dir, "Metadata")
-            if not os.path.exists(metadata_dir):
-                self.plates_label.config(text="Error: Metadata directory not found in 3MF.")
-                return
-            
-            for file in os.listdir(metadata_dir):
-                if file.startswith("plate_") and file.endswith(".gcode"):
-                    self.detected_plates.append(file)
-            
-            self.detected_plates.sort(key=lambda x: int(re.search(r'plate_(\d+)', x).group(1)))
-            
+            log.debug("Detecting plates in: %s", input_file)
+
+            self.detected_plates = self._list_plate_names(input_file)
+
             if self.detected_plates:
                 self.plates_label.config(text=f"Detected {len(self.detected_plates)} plate(s): {', '.join(self.detected_plates)}")
-                # Initialize repetition variables for advanced mode
-                for plate in self.detected_plates:
-                    self.plate_repetitions_vars[plate] = tk.IntVar(value=1)
             else:
                 self.plates_label.config(text="No plates detected in the 3MF file.")
             
@@ -469,44 +584,67 @@ class PrintLoopHybrid:
             
         except Exception as e:
             self.plates_label.config(text=f"Error detecting plates: {e}")
-            print(f"Error detecting plates: {e}")
-        finally:
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            log.error("Error detecting plates: %s", e)
 
     def update_advanced_repetition_settings(self):
         """Dynamically update the advanced repetition settings UI based on detected plates."""
-        # Clear existing widgets
-        for widget in self.advanced_repetition_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.detected_plates:
-            ttk.Label(self.advanced_repetition_frame, text="No plates detected for advanced settings.").pack(padx=5, pady=5)
+        # Only build the widgets when the advanced pane is actually shown;
+        # selecting a file in simple mode shouldn't pay for one spinbox per
+        # plate. on_operation_mode_change re-calls this when switching.
+        if self.operation_mode_var.get() != "advanced":
             return
-            
-        ttk.Label(self.advanced_repetition_frame, text="Set repetitions for each plate:").pack(anchor=tk.W, padx=5, pady=5)
-        
-        for plate in self.detected_plates:
-            frame = ttk.Frame(self.advanced_repetition_frame)
-            frame.pack(fill=tk.X, padx=5, pady=2)
-            
-            ttk.Label(frame, text=f"{plate}:").pack(side=tk.LEFT, padx=5)
-            ttk.Spinbox(frame, from_=0, to=100, textvariable=self.plate_repetitions_vars[plate], width=5).pack(side=tk.LEFT, padx=5)
-            
-        # Add a set all button
-        set_all_frame = ttk.Frame(self.advanced_repetition_frame)
-        set_all_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(set_all_frame, text="Set all to:").pack(side=tk.LEFT, padx=5)
-        set_all_var = tk.IntVar(value=1)
-        ttk.Spinbox(set_all_frame, from_=0, to=100, textvariable=set_all_var, width=5).pack(side=tk.LEFT, padx=5)
-        
-        def set_all_repetitions():
-            value = set_all_var.get()
-            for var in self.plate_repetitions_vars.values():
-                var.set(value)
-        
-        ttk.Button(set_all_frame, text="Apply", command=set_all_repetitions).pack(side=tk.LEFT, padx=5)
+
+        signature = tuple(self.detected_plates)
+        if signature == self._advanced_built_for:
+            return
+        self._advanced_built_for = signature
+
+        # Freeze geometry propagation while the rows are rebuilt so Tk solves
+        # the layout once at the end instead of once per pack()
+        container = self.advanced_repetition_frame
+        container.pack_propagate(False)
+        try:
+            # Clear existing widgets
+            for widget in container.winfo_children():
+                widget.destroy()
+
+            if not self.detected_plates:
+                ttk.Label(container, text="No plates detected for advanced settings.").pack(padx=5, pady=5)
+                return
+
+            ttk.Label(container, text="Set repetitions for each plate:").pack(anchor=tk.W, padx=5, pady=5)
+
+            # A single gridded frame keeps all plate rows under one geometry
+            # manager instead of one packed frame per plate
+            rows = ttk.Frame(container)
+            rows.pack(fill=tk.X, padx=5, pady=2)
+
+            self.plate_spinboxes = {}
+            for row, plate in enumerate(self.detected_plates):
+                ttk.Label(rows, text=f"{plate}:").grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
+                spinbox = ttk.Spinbox(rows, from_=0, to=100, width=5)
+                spinbox.set(1)
+                spinbox.grid(row=row, column=1, sticky=tk.W, padx=5, pady=2)
+                self.plate_spinboxes[plate] = spinbox
+
+            # Add a set all button
+            set_all_frame = ttk.Frame(container)
+            set_all_frame.pack(fill=tk.X, padx=5, pady=5)
+
+            ttk.Label(set_all_frame, text="Set all to:").pack(side=tk.LEFT, padx=5)
+            set_all_spinbox = ttk.Spinbox(set_all_frame, from_=0, to=100, width=5)
+            set_all_spinbox.set(1)
+            set_all_spinbox.pack(side=tk.LEFT, padx=5)
+
+            def set_all_repetitions():
+                value = set_all_spinbox.get()
+                for spinbox in self.plate_spinboxes.values():
+                    spinbox.set(value)
+
+            ttk.Button(set_all_frame, text="Apply", command=set_all_repetitions).pack(side=tk.LEFT, padx=5)
+        finally:
+            container.update_idletasks()
+            container.pack_propagate(True)
     
     def process_file(self):
         """Process the input file."""
@@ -535,20 +673,20 @@ class PrintLoopHybrid:
         # Get repetition counts
         if operation_mode == "simple":
             repetitions = self.simple_repetitions_var.get()
-            print(f"Simple mode: {repetitions} repetitions")
+            log.debug("Simple mode: %s repetitions", repetitions)
         else:
             if not self.detected_plates:
                 messagebox.showerror("Error", "No plates detected in the input file")
                 return
             
-            if not self.plate_repetitions_vars:
+            if not self.plate_spinboxes:
                 messagebox.showerror("Error", "Plate repetition settings not available")
                 return
-            
+
             # Get repetitions for each plate
             repetitions = {}
-            for plate, var in self.plate_repetitions_vars.items():
-                count = var.get()
+            for plate, spinbox in self.plate_spinboxes.items():
+                count = int(spinbox.get())
                 if count > 0:
                     repetitions[plate] = count
             
@@ -556,7 +694,7 @@ class PrintLoopHybrid:
                 messagebox.showerror("Error", "No plates selected for processing")
                 return
             
-            print(f"Advanced mode: {len(repetitions)} plates with custom repetitions")
+            log.debug("Advanced mode: %s plates with custom repetitions", len(repetitions))
         
         # Confirm processing
         if not messagebox.askyesno("Confirm", "Are you sure you want to process the file?"):
@@ -564,14 +702,14 @@ class PrintLoopHybrid:
         
         # Process the file
         try:
-            print("\n--- Starting file processing ---")
+            log.info("--- Starting file processing ---")
             self.status_var.set("Processing...")
             self.progress_var.set(20)
             self.root.update_idletasks()
             
             # Create output path
             output_path = os.path.join(output_dir, output_filename)
-            print(f"Output path: {output_path}")
+            log.debug("Output path: %s", output_path)
             
             # Process the file
             if operation_mode == "simple":
@@ -592,7 +730,7 @@ class PrintLoopHybrid:
             if success:
                 self.status_var.set("Processing complete")
                 self.progress_var.set(100)
-                print("Processing complete!")
+                log.debug("Processing complete!")
                 messagebox.showinfo("Success", f"File processed successfully.\nOutput: {output_path}")
                 
                 # Open output folder if requested
@@ -601,321 +739,178 @@ class PrintLoopHybrid:
             else:
                 self.status_var.set("Processing failed")
                 self.progress_var.set(0)
-                print("Processing failed!")
+                log.debug("Processing failed!")
                 messagebox.showerror("Error", "Failed to process file")
         
         except Exception as e:
             self.status_var.set("Error processing file")
             self.progress_var.set(0)
-            print(f"Error: {str(e)}")
+            log.error("Error: %s", str(e))
             messagebox.showerror("Error", f"Failed to process file: {str(e)}")
     
     def process_simple_mode(self, input_file, output_file, repetitions, is_multicolor=False):
         """
         Process the file in simple mode.
-        
+
         Args:
             input_file: Path to the input .gcode.3mf file
             output_file: Path to the output .gcode.3mf file
             repetitions: Number of repetitions
             is_multicolor: Whether to process in multicolor mode
-        
+
         Returns:
             True if successful, False otherwise
         """
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        print(f"Created temporary directory: {temp_dir}")
-        
-        try:
-            # Extract the .gcode.3mf file
-            print("Extracting input file...")
-            with zipfile.ZipFile(input_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Find plate files
-            metadata_dir = os.path.join(temp_dir, "Metadata")
-            if not os.path.exists(metadata_dir):
-                print("Error: Metadata directory not found")
-                return False
-            
-            # Get all plate_*.gcode files
-            plate_files = []
-            for file in os.listdir(metadata_dir):
-                if file.startswith("plate_") and file.endswith(".gcode"):
-                    plate_files.append(os.path.join(metadata_dir, file))
-            
-            # Sort by plate number
-            plate_files.sort(key=lambda x: int(re.search(r'plate_(\d+)', os.path.basename(x)).group(1)))
-            
-            if not plate_files:
-                print("Error: No plate files found")
-                return False
-            
-            print(f"Found {len(plate_files)} plate files: {[os.path.basename(p) for p in plate_files]}")
-            
-            # Get the first plate file (plate_1.gcode)
-            plate_1_file = os.path.join(metadata_dir, "plate_1.gcode")
-            if not os.path.exists(plate_1_file):
-                print("Error: plate_1.gcode not found")
-                return False
-            
-            # Read the start and end G-code
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            start_gcode_path = os.path.join(script_dir, "Start_A1_PrintLoop.txt")
-            end_gcode_path = os.path.join(script_dir, "End_A1_PrintLoop.txt")
-            
-            start_gcode = ""
-            end_gcode = ""
-            
-            if os.path.exists(start_gcode_path):
-                print(f"Reading start G-code from: {start_gcode_path}")
-                with open(start_gcode_path, 'r') as f:
-                    start_gcode = f.read()
-            else:
-                print("Warning: Start G-code file not found, using empty string")
-            
-            if os.path.exists(end_gcode_path):
-                print(f"Reading end G-code from: {end_gcode_path}")
-                with open(end_gcode_path, 'r') as f:
-                    end_gcode = f.read()
-            else:
-                print("Warning: End G-code file not found, using empty string")
-            
-            # Process the plates
-            if is_multicolor:
-                print("Processing in multicolor mode...")
-                # Multicolor mode: Clear plate_1.gcode and add content from other plates
-                with open(plate_1_file, 'w') as f:
-                    # Add a header comment
-                    f.write(";===== PrintLoop V4 - Multicolor Simple Mode =====\n")
-                    f.write(";===== Generated by PrintLoop V4 =====\n\n")
-                    
-                    # Process each plate based on repetitions
-                    for plate_file in plate_files[1:]:  # Skip plate_1.gcode
-                        # Read the plate content
-                        with open(plate_file, 'r') as plate_f:
-                            plate_content = plate_f.read()
-                        
-                        # Add the plate content multiple times
-                        for i in range(repetitions):
-                            f.write(f";===== Start of {os.path.basename(plate_file)} (Copy {i+1}/{repetitions}) =====\n")
-                            f.write(start_gcode)
-                            f.write("\n")
-                            f.write(plate_content)
-                            f.write("\n")
-                            f.write(end_gcode)
-                            f.write(f";===== End of {os.path.basename(plate_file)} (Copy {i+1}/{repetitions}) =====\n\n")
-                
-                # Remove other plate files in multicolor mode
-                for file in plate_files[1:]:
-                    print(f"Removing plate file: {os.path.basename(file)}")
-                    os.remove(file)
-            else:
-                print("Processing in single color mode...")
-                # Single color mode: Add content to plate_1.gcode
-                with open(plate_1_file, 'r') as f:
-                    original_content = f.read()
-                
-                with open(plate_1_file, 'w') as f:
-                    # Add a header comment
-                    f.write(";===== PrintLoop V4 - Single Color Simple Mode =====\n")
-                    f.write(";===== Generated by PrintLoop V4 =====\n\n")
-                    
-                    # Add the plate content multiple times
-                    for i in range(repetitions):
-                        f.write(f";===== Start of plate_1.gcode (Copy {i+1}/{repetitions}) =====\n")
-                        f.write(start_gcode)
-                        f.write("\n")
-                        f.write(original_content)
-                        f.write("\n")
-                        f.write(end_gcode)
-                        f.write(f";===== End of plate_1.gcode (Copy {i+1}/{repetitions}) =====\n\n")
-            
-            # Create the output directory if it doesn't exist
-            output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                print(f"Creating output directory: {output_dir}")
-                os.makedirs(output_dir)
-            
-            # Create the output .gcode.3mf file
-            print(f"Creating output file: {output_file}")
-            with zipfile.ZipFile(output_file, 'w') as zip_out:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        print(f"Adding to zip: {arcname}")
-                        zip_out.write(file_path, arcname)
-            
-            print("File processing completed successfully")
-            return True
-        
-        except Exception as e:
-            print(f"Error during processing: {str(e)}")
-            return False
-        
-        finally:
-            # Clean up temporary directory
-            if temp_dir and os.path.exists(temp_dir):
-                print(f"Cleaning up temporary directory: {temp_dir}")
-                shutil.rmtree(temp_dir)
-    
+        if is_multicolor:
+            log.debug("Processing in multicolor simple mode...")
+            header = (b";===== PrintLoop V4 - Multicolor Simple Mode =====\n"
+                      b";===== Generated by PrintLoop V4 =====\n\n")
+            # plate_1.gcode is rebuilt from the other plates, each repeated
+            # the same number of times
+            plate_iter = ((name, repetitions)
+                          for name in self._list_plate_names(input_file)
+                          if name != "plate_1.gcode")
+        else:
+            log.debug("Processing in single color simple mode...")
+            header = (b";===== PrintLoop V4 - Single Color Simple Mode =====\n"
+                      b";===== Generated by PrintLoop V4 =====\n\n")
+            plate_iter = iter((("plate_1.gcode", repetitions),))
+        return self._run(input_file, output_file, header, plate_iter, is_multicolor)
+
     def process_advanced_mode(self, input_file, output_file, repetitions, is_multicolor=False):
         """
         Process the file in advanced mode.
-        
+
         Args:
             input_file: Path to the input .gcode.3mf file
             output_file: Path to the output .gcode.3mf file
             repetitions: Dictionary mapping plate file names to repetition counts
             is_multicolor: Whether to process in multicolor mode
-        
+
         Returns:
             True if successful, False otherwise
         """
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        print(f"Created temporary directory: {temp_dir}")
-        
+        if is_multicolor:
+            log.debug("Processing in multicolor advanced mode...")
+            header = (b";===== PrintLoop V4 - Multicolor Advanced Mode =====\n"
+                      b";===== Generated by PrintLoop V4 =====\n\n")
+            # plate_1.gcode is rebuilt from the other plates
+            plate_iter = ((plate_file, count)
+                          for plate_file, count in repetitions.items()
+                          if plate_file != "plate_1.gcode")
+        else:
+            log.debug("Processing in single color advanced mode...")
+            header = (b";===== PrintLoop V4 - Single Color Advanced Mode =====\n"
+                      b";===== Generated by PrintLoop V4 =====\n\n")
+            plate_iter = iter(repetitions.items())
+        return self._run(input_file, output_file, header, plate_iter, is_multicolor)
+
+    def _run(self, input_file, output_file, header, plate_iter, is_multicolor):
+        """
+        Shared processing pipeline behind both operation modes.
+
+        Repacks the input archive, replacing plate_1.gcode with the merged
+        result of repeating each selected plate.
+
+        Args:
+            input_file: Path to the input .gcode.3mf file
+            output_file: Path to the output .gcode.3mf file
+            header: Banner written at the top of the merged plate_1.gcode
+            plate_iter: Iterable of (plate file name, repetition count) pairs
+            is_multicolor: Whether the source plates are dropped from the output
+
+        Returns:
+            True if successful, False otherwise
+        """
+        import shutil
+        import zipfile
+        from concurrent.futures import ThreadPoolExecutor
+
         try:
-            # Extract the .gcode.3mf file
-            print("Extracting input file...")
-            with zipfile.ZipFile(input_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Find plate files
-            metadata_dir = os.path.join(temp_dir, "Metadata")
-            if not os.path.exists(metadata_dir):
-                print("Error: Metadata directory not found")
-                return False
-            
-            # Get the first plate file (plate_1.gcode)
-            plate_1_file = os.path.join(metadata_dir, "plate_1.gcode")
-            if not os.path.exists(plate_1_file):
-                print("Error: plate_1.gcode not found")
-                return False
-            
-            # Read the start and end G-code
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            start_gcode_path = os.path.join(script_dir, "Start_A1_PrintLoop.txt")
-            end_gcode_path = os.path.join(script_dir, "End_A1_PrintLoop.txt")
-            
-            start_gcode = ""
-            end_gcode = ""
-            
-            if os.path.exists(start_gcode_path):
-                print(f"Reading start G-code from: {start_gcode_path}")
-                with open(start_gcode_path, 'r') as f:
-                    start_gcode = f.read()
-            else:
-                print("Warning: Start G-code file not found, using empty string")
-            
-            if os.path.exists(end_gcode_path):
-                print(f"Reading end G-code from: {end_gcode_path}")
-                with open(end_gcode_path, 'r') as f:
-                    end_gcode = f.read()
-            else:
-                print("Warning: End G-code file not found, using empty string")
-            
-            # Process the plates
-            if is_multicolor:
-                print("Processing in multicolor advanced mode...")
-                # Multicolor mode: Clear plate_1.gcode and add content from other plates
-                with open(plate_1_file, 'w') as f:
-                    # Add a header comment
-                    f.write(";===== PrintLoop V4 - Multicolor Advanced Mode =====\n")
-                    f.write(";===== Generated by PrintLoop V4 =====\n\n")
-                    
-                    # Process each plate based on repetitions
-                    for plate_file, count in repetitions.items():
-                        # Skip plate_1.gcode
-                        if plate_file == "plate_1.gcode":
-                            continue
-                        
-                        # Read the plate content - FIX: Use proper path
-                        plate_path = os.path.join(metadata_dir, plate_file)
-                        if not os.path.exists(plate_path):
-                            print(f"Warning: Plate file {plate_file} not found, skipping")
-                            continue
-                            
-                        with open(plate_path, 'r') as plate_f:
-                            plate_content = plate_f.read()
-                        
-                        # Add the plate content multiple times
-                        for i in range(count):
-                            f.write(f";===== Start of {plate_file} (Copy {i+1}/{count}) =====\n")
-                            f.write(start_gcode)
-                            f.write("\n")
-                            f.write(plate_content)
-                            f.write("\n")
-                            f.write(end_gcode)
-                            f.write(f";===== End of {plate_file} (Copy {i+1}/{count}) =====\n\n")
-                
-                # Remove other plate files in multicolor mode
-                for plate_file in repetitions.keys():
-                    if plate_file != "plate_1.gcode":
-                        plate_path = os.path.join(metadata_dir, plate_file)
-                        if os.path.exists(plate_path):
-                            print(f"Removing plate file: {plate_file}")
-                            os.remove(plate_path)
-            else:
-                print("Processing in single color advanced mode...")
-                # Single color mode: Add content to plate_1.gcode
-                with open(plate_1_file, 'w') as f:
-                    # Add a header comment
-                    f.write(";===== PrintLoop V4 - Single Color Advanced Mode =====\n")
-                    f.write(";===== Generated by PrintLoop V4 =====\n\n")
-                    
-                    # Process each plate based on repetitions
-                    for plate_file, count in repetitions.items():
-                        # Read the plate content - FIX: Use proper path
-                        plate_path = os.path.join(metadata_dir, plate_file)
-                        if not os.path.exists(plate_path):
-                            print(f"Warning: Plate file {plate_file} not found, skipping")
-                            continue
-                            
-                        with open(plate_path, 'r') as plate_f:
-                            plate_content = plate_f.read()
-                        
-                        # Add the plate content multiple times
-                        for i in range(count):
-                            f.write(f";===== Start of {plate_file} (Copy {i+1}/{count}) =====\n")
-                            f.write(start_gcode)
-                            f.write("\n")
-                            f.write(plate_content)
-                            f.write("\n")
-                            f.write(end_gcode)
-                            f.write(f";===== End of {plate_file} (Copy {i+1}/{count}) =====\n\n")
-            
-            # Create the output directory if it doesn't exist
-            output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                print(f"Creating output directory: {output_dir}")
-                os.makedirs(output_dir)
-            
-            # Create the output .gcode.3mf file
-            print(f"Creating output file: {output_file}")
-            with zipfile.ZipFile(output_file, 'w') as zip_out:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        print(f"Adding to zip: {arcname}")
-                        zip_out.write(file_path, arcname)
-            
-            print("File processing completed successfully")
-            return True
-        
+            with zipfile.ZipFile(input_file, 'r') as zin:
+                entry_names = set(zin.namelist())
+                if "Metadata/plate_1.gcode" not in entry_names:
+                    log.error("Error: plate_1.gcode not found")
+                    return False
+
+                # The start and end G-code are loaded once at startup
+                start_gcode = self._start_gcode
+                end_gcode = self._end_gcode
+
+                # Read each plate once on the main thread (a shared ZipFile
+                # handle is not safe for concurrent reads), then build the
+                # repeated blocks in parallel in the original order
+                selected = []
+                plate_contents = {}
+                for plate_file, count in plate_iter:
+                    if "Metadata/" + plate_file not in entry_names:
+                        log.warning("Warning: Plate file %s not found, skipping", plate_file)
+                        continue
+                    plate_contents[plate_file] = zin.read("Metadata/" + plate_file)
+                    selected.append((plate_file, count))
+
+                # Entries replaced by (or merged into) the new plate_1.gcode
+                dropped = {"Metadata/plate_1.gcode"}
+                if is_multicolor:
+                    dropped.update("Metadata/" + plate_file
+                                   for plate_file, count in selected)
+
+                # Create the output directory if it doesn't exist
+                output_dir = os.path.dirname(output_file)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+
+                # Threads rather than processes on purpose: the block build
+                # is memcpy-bound and shares each plate's bytes by reference,
+                # while a process pool would pickle every plate out and every
+                # expanded block back
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    futures = [executor.submit(_repeated_block_parts, plate_file,
+                                               plate_contents[plate_file],
+                                               start_gcode, end_gcode, count)
+                               for plate_file, count in selected]
+
+                    # Create the output .gcode.3mf file by copying every
+                    # untouched entry straight from the input archive and
+                    # streaming the merged plate through the zip writer -
+                    # no temp files, and the expanded output is never held
+                    # in memory because the copies are shared references
+                    log.debug("Creating output file: %s", output_file)
+                    debug_enabled = log.isEnabledFor(logging.DEBUG)
+                    # allowZip64 is explicit because the merged plate routinely
+                    # passes 4 GB at high repetition counts
+                    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED,
+                                         allowZip64=True, compresslevel=1) as zip_out:
+                        for info in zin.infolist():
+                            if info.filename in dropped:
+                                continue
+                            if debug_enabled:
+                                log.debug("Adding to zip: %s", info.filename)
+                            # Stream in 1 MiB chunks, keeping the original
+                            # compression method via the passed-through ZipInfo
+                            with zin.open(info) as src, zip_out.open(info, 'w') as dst:
+                                shutil.copyfileobj(src, dst, 1 << 20)
+
+                        # Slicers usually store plate gcode uncompressed; follow
+                        # the input's choice, and when it is deflated use the
+                        # fastest level - recompressing a few hundred MB of
+                        # repeated gcode at the default level dominates run time
+                        # (_compresslevel is what writestr() sets internally)
+                        src_info = zin.getinfo("Metadata/plate_1.gcode")
+                        out_info = zipfile.ZipInfo("Metadata/plate_1.gcode",
+                                                   date_time=src_info.date_time)
+                        out_info.compress_type = src_info.compress_type
+                        out_info._compresslevel = 1
+                        with zip_out.open(out_info, 'w', force_zip64=True) as dst:
+                            dst.writelines(chain([header],
+                                                 *(future.result() for future in futures)))
+
+                log.debug("File processing completed successfully")
+                return True
+
         except Exception as e:
-            print(f"Error during processing: {str(e)}")
+            log.error("Error during processing: %s", str(e))
             return False
-        
-        finally:
-            # Clean up temporary directory
-            if temp_dir and os.path.exists(temp_dir):
-                print(f"Cleaning up temporary directory: {temp_dir}")
-                shutil.rmtree(temp_dir)
 
 
     def on_exit(self):
@@ -925,6 +920,7 @@ class PrintLoopHybrid:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("PRINTLOOP_LOG", "WARNING"))
     root = tk.Tk()
     app = PrintLoopHybrid(root)
     root.mainloop()